@@ -0,0 +1,69 @@
+"""Shared fixtures for blue-backup tests."""
+
+from __future__ import annotations
+
+import datetime
+import os
+import subprocess
+import tempfile
+from typing import Iterator
+
+import pytest
+from fake_datetime import FIRST_FAKE_DATE, FakeDatetime
+
+# Keep the temporary test folders in RAM, when possible, since the tests are
+# dominated by small file operations. This includes the btrfs image file.
+TMPFS_FOLDER = "/dev/shm"  # noqa: S108
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the test markers and use tmpfs for the temporary folders.
+
+    tmpfs is not used if --basetemp or the TMPDIR environment variable is set.
+    """
+    config.addinivalue_line(
+        "markers", "slow: waits for real timeouts, not run by default (tox -e slow)"
+    )
+    # Registered here too, for runs without pytest-xdist:
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run the tests of the group on one xdist worker"
+    )
+    # pytest-xdist passes --basetemp to its workers.
+    if (
+        config.option.basetemp is None and not os.environ.get("TMPDIR")
+        and os.access(TMPFS_FOLDER, os.W_OK)
+    ):
+        tempfile.tempdir = TMPFS_FOLDER
+
+
+@pytest.fixture(autouse=True)
+def _fake_datetime(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Mock today's date in every test, starting from FIRST_FAKE_DATE."""
+    monkeypatch.setattr(FakeDatetime, "fake_today", FIRST_FAKE_DATE)
+    monkeypatch.setattr(datetime, "datetime", FakeDatetime)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _ssh_control_master(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """Let all rsync runs to the same host share a single ssh connection."""
+    control_folder = tmp_path_factory.mktemp("ssh")
+    with pytest.MonkeyPatch.context() as mp:
+        # The master connection is opened by the first ssh to each host.
+        # %C is a hash of the local host, remote host, port and user, so
+        # connections as different users or ports get separate masters.
+        mp.setenv(
+            "RSYNC_RSH",
+            "/usr/bin/ssh -o ControlMaster=auto -o ControlPersist=60 "
+            f"-o ControlPath={control_folder}/%C"
+        )
+        yield
+    for control_path in control_folder.iterdir():
+        # Stop the master connection. The socket path selects the master,
+        # so the destination argument is ignored:
+        subprocess.run(
+            [
+                "/usr/bin/ssh", "-o", f"ControlPath={control_path}",
+                "-O", "exit", "localhost",
+            ],
+            check=False, capture_output=True,
+        )
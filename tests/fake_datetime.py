@@ -0,0 +1,38 @@
+"""Fake datetime class for mocking today's date in blue-backup tests."""
+
+from __future__ import annotations
+
+import datetime
+import sys
+from typing import ClassVar
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:  # Avoid depending on typing-extensions
+    Self = None
+
+# Select first fake date to test accumulation of monthly backups:
+FIRST_FAKE_DATE = 1999, 12, 25
+
+
+class FakeDatetime(datetime.datetime):
+    """Fake the datetime class to mock today's date."""
+
+    fake_today = FIRST_FAKE_DATE
+    # datetime objects are immutable, so now() can return the same one:
+    now_cache: ClassVar[dict[tuple[int, int, int], Self]] = {}
+
+    @classmethod
+    def now(cls, tz: datetime.tzinfo | None = None) -> Self:
+        """Mock today's date."""
+        now = cls.now_cache.get(FakeDatetime.fake_today)
+        if now is None:
+            tz = datetime.timezone.utc
+            now = cls(*FakeDatetime.fake_today, tzinfo=tz)
+            cls.now_cache[FakeDatetime.fake_today] = now
+        return now
+
+    def astimezone(self, tz: datetime.tzinfo | None = None) -> Self:
+        """Force time zone to UTC for consistent test output."""
+        tz = datetime.timezone.utc
+        return super().astimezone(tz=tz)  # pylint: disable=no-member
@@ -11,44 +11,72 @@ import runpy
 import shutil
 import subprocess
 import sys
-from typing import Iterator
-
-if sys.version_info >= (3, 11):
-    from typing import Self
-else:  # Avoid depending on typing-extensions
-    Self = None
+from typing import Iterator, Sequence
 
 import pytest
+from fake_datetime import FIRST_FAKE_DATE, FakeDatetime
 
 # import blue_backup.py which is a softlink to blue-backup:
 import blue_backup
 
-# Select first fake date to test accumulation of monthly backups:
-FIRST_FAKE_DATE = 1999, 12, 25
+# Remote tests use local address 127.0.0.1. Therefore, these tests will fail
+# to catch bugs of mixing between local and remote location.
+# Before running the test it is recommended to: ssh-copy-id 127.0.0.1
 
 
-class FakeDatetime(datetime.datetime):
-    """Fake the datetime class to mock today's date."""
+def clone_tree(source: pathlib.Path, target: pathlib.Path) -> None:
+    """Copy a read-only folder tree, hard linking the files when possible."""
+    # Hard links cannot cross filesystems, e.g. into the btrfs sandbox:
+    same_filesystem = source.stat().st_dev == target.parent.stat().st_dev
+    shutil.copytree(
+        source, target, copy_function=os.link if same_filesystem else shutil.copy2
+    )
 
-    fake_today = FIRST_FAKE_DATE
 
-    @classmethod
-    def now(cls, tz: datetime.tzinfo | None = None) -> Self:
-        """Mock today's date."""
-        tz = datetime.timezone.utc
-        return cls(*FakeDatetime.fake_today, tzinfo=tz)
+def is_btrfs(path: pathlib.Path) -> bool:
+    """Check if path is in a btrfs filesystem."""
+    proc = subprocess.run(
+        ["/usr/bin/stat", "--file-system", "--format=%T", str(path)],
+        check=True, capture_output=True,
+    )
+    return proc.stdout.decode("utf-8").strip() == "btrfs"
 
-    def astimezone(self, tz: datetime.tzinfo | None = None) -> Self:
-        """Force time zone to UTC for consistent test output."""
-        tz = datetime.timezone.utc
-        return super().astimezone(tz=tz)  # pylint: disable=no-member
 
+def stub_rsync(
+    monkeypatch: pytest.MonkeyPatch,
+    proc: subprocess.CompletedProcess[bytes],
+) -> list[Sequence[str]]:
+    """Return proc for rsync calls instead of running rsync.
+
+    The returned list collects the arguments of the stubbed rsync calls.
+    """
+    run = blue_backup.Connection.run
+    rsync_args: list[Sequence[str]] = []
+
+    def mock_run(
+        self: blue_backup.Connection,
+        args: Sequence[str],
+        *,
+        force_local: bool = False,
+    ) -> subprocess.CompletedProcess[bytes]:
+        if args[0] == "/usr/bin/rsync":
+            rsync_args.append(args)
+            return proc
+        return run(self, args, force_local=force_local)
 
-datetime.datetime = FakeDatetime  # type: ignore[misc]
+    monkeypatch.setattr(blue_backup.Connection, "run", mock_run)
+    return rsync_args
 
-# Remote tests use local address 127.0.0.1. Therefore, these tests will fail
-# to catch bugs of mixing between local and remote location.
-# Before running the test it is recommended to: ssh-copy-id 127.0.0.1
+
+@pytest.fixture(name="data_to_backup", scope="session")
+def fixture_data_to_backup(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    """Copy the test data once per session, for the tests to clone from.
+
+    The tests hard link to these files, so they must not be modified.
+    """
+    data_path = tmp_path_factory.mktemp("data") / "data-to-backup"
+    shutil.copytree("tests/data-to-backup", data_path)
+    return data_path
 
 
 @pytest.mark.parametrize(("toml_config", "short_test"), [
@@ -59,6 +87,7 @@ datetime.datetime = FakeDatetime  # type: ignore[misc]
 def test_basic_fs(
     tmp_path: pathlib.Path,
     capsys: pytest.CaptureFixture[str],
+    data_to_backup: pathlib.Path,
     *,
     toml_config: str,
     short_test: bool,
@@ -67,9 +96,7 @@ def test_basic_fs(
     # The configuration file is copied so that TOML_FOLDER would point to tmp_path.
     toml_filename = str(tmp_path / toml_config)
     shutil.copy(f"tests/{toml_config}", toml_filename)
-    shutil.copytree("tests/data-to-backup", tmp_path / "data-to-backup")
-
-    FakeDatetime.fake_today = FIRST_FAKE_DATE
+    clone_tree(data_to_backup, tmp_path / "data-to-backup")
 
     target_path = tmp_path / "target"
     # Try and fail backup to non-existing target folder:
@@ -163,13 +190,12 @@ def subtest_offsite_mode(
     offsite_path.mkdir()
     toml_file = tmp_path / "blue-offsite.toml"
 
-    with toml_file.open("w") as tfile:
-        tfile.write(
-            "target-location='{TOML_FOLDER}/offsite/{LATEST}'\n"
-            "[backup-folders.'{TOML_FOLDER}/target/{LATEST}']\n"
-            "target=''\n"
-            "rsync-options=['--backup-dir=old']"
-        )
+    toml_file.write_text(
+        "target-location='{TOML_FOLDER}/offsite/{LATEST}'\n"
+        "[backup-folders.'{TOML_FOLDER}/target/{LATEST}']\n"
+        "target=''\n"
+        "rsync-options=['--backup-dir=old']"
+    )
     with pytest.raises(SystemExit, match="1"):
         blue_backup.main(str(toml_file))
     captured = capsys.readouterr()
@@ -217,29 +243,50 @@ def subtest_offsite_mode(
     assert (offsite_path / today / "old" / "data-to-backup" / "file-1.txt").exists()
 
 
+KEPT_BACKUPS_RE = re.compile(r"Kept backups: (\d+) monthly, (\d+) daily")
+# Split errors, each error from a failed command ends with its return code:
+COMMAND_ERROR_RE = re.compile(r".*?Return code: -?\d+\n|.+", re.DOTALL)
+
+
 def subtest_multi_dates_backup(
     toml_filename: str,
     capsys: pytest.CaptureFixture[str],
 ) -> None:
     """Simulate backups on multiple days."""
-    # Loop over enough days to have old daily backups removed:
-    for i in range(1, 23):
-        next_date = FakeDatetime.now().date() + datetime.timedelta(days=1)
-        FakeDatetime.fake_today = next_date.timetuple()[:3]
-        blue_backup.main(toml_filename)
-        captured = capsys.readouterr()
-        monthly_backups = 1 if FIRST_FAKE_DATE[0] in FakeDatetime.fake_today else 2
-        daily_backups = min(i + 1 - monthly_backups, 20)
-        assert (
-            f"Kept backups: {monthly_backups} monthly, {daily_backups} daily" in
-            captured.out
+    expected_kept_backups: list[tuple[int, int]] = []
+    capsys.readouterr()  # Discard earlier output, the loop output is read at once.
+    with pytest.MonkeyPatch.context() as mp:
+        # Only the snapshot rotation is tested here, and the kept backups
+        # counts do not depend on what rsync transfers. The snapshots may
+        # differ from the source, e.g. after subtest_offsite_mode modified
+        # one, until the real rsync on the last day syncs them again.
+        stub_rsync(
+            mp, subprocess.CompletedProcess([], returncode=0, stdout=b"", stderr=b"")
         )
-        if captured.err != "":
-            # Deleting a btrfs subvolume without root permissions is tricky.
-            assert (
-                "ERROR: Could not destroy subvolume/snapshot: Operation not permitted"
-                in captured.err
-            )
+        # Loop over enough days to have old daily backups removed:
+        for i in range(1, 23):
+            if i == 22:
+                # Run the real rsync on the last day, to check the whole backup:
+                mp.undo()
+            next_date = FakeDatetime.now().date() + datetime.timedelta(days=1)
+            FakeDatetime.fake_today = next_date.timetuple()[:3]
+            blue_backup.main(toml_filename)
+            monthly_backups = 1 if FIRST_FAKE_DATE[0] in FakeDatetime.fake_today else 2
+            daily_backups = min(i + 1 - monthly_backups, 20)
+            expected_kept_backups.append((monthly_backups, daily_backups))
+
+    captured = capsys.readouterr()
+    kept_backups = [
+        (int(match[1]), int(match[2]))
+        for match in KEPT_BACKUPS_RE.finditer(captured.out)
+    ]
+    assert kept_backups == expected_kept_backups
+    # Deleting a btrfs subvolume without root permissions is tricky.
+    assert [
+        err for err in COMMAND_ERROR_RE.findall(captured.err)
+        if "ERROR: Could not destroy subvolume/snapshot: Operation not permitted"
+        not in err
+    ] == []
 
 
 def subtest_copy_failure(
@@ -248,9 +295,8 @@ def subtest_copy_failure(
     capsys: pytest.CaptureFixture[str],
 ) -> None:
     """Test failure creating hard link copy."""
-    if target_path.parts[1] != "tmp":
-        # If target does not start with "/tmp", btrfs mode is being tested
-        # and btrfs uses subvolume snapshot instead of hard link copy.
+    if is_btrfs(target_path):
+        # btrfs uses subvolume snapshot instead of hard link copy.
         return
     next_date = FakeDatetime.now().date() + datetime.timedelta(days=1)
     FakeDatetime.fake_today = next_date.timetuple()[:3]
@@ -316,6 +362,15 @@ def subtest_iso_date_folders(
         )
 
 
+# Parse the output of udisksctl:
+# Mapped file btrfs.img as /dev/loop0.
+LOOP_SETUP_RE = re.compile(r"Mapped file (\S+) as (\S+)\.")
+# Mounted /dev/loop0 at /media/user/uuid
+MOUNTED_RE = re.compile(r"Mounted (\S+) at (\S+)")
+# Device /dev/loop0 is already mounted at `/media/user/uuid'.
+ALREADY_MOUNTED_RE = re.compile(r"already mounted at `(\S+)'")
+
+
 @contextlib.contextmanager
 def btrfs_mount_point(
     path: pathlib.Path, *, test_already_mounted: bool = False
@@ -341,9 +396,7 @@ def btrfs_mount_point(
         ],
         check=True, capture_output=True
     )
-    # Output udisksctl looks like:
-    # Mapped file btrfs.img as /dev/loop0.
-    match = re.search(r"Mapped file (\S+) as (\S+)\.", proc.stdout.decode("utf-8"))
+    match = LOOP_SETUP_RE.search(proc.stdout.decode("utf-8"))
     assert match is not None
     loop_dev = match.group(2)
     try:
@@ -369,14 +422,11 @@ def btrfs_mount_point(
             # GDBus.Error:org.freedesktop.UDisks2.Error.AlreadyMounted:
             # Device /dev/loop0 is already mounted at `{mount_point}'.\n\n"
             assert b"org.freedesktop.UDisks2.Error.AlreadyMounted:" in proc.stderr
-            match = re.search(
-                r"already mounted at `(\S+)'", proc.stderr.decode("utf-8")
-            )
+            match = ALREADY_MOUNTED_RE.search(proc.stderr.decode("utf-8"))
             assert match is not None
             mount_point = pathlib.Path(match.group(1))
         else:
-            # Mounted {loop_dev} at {mount_point}
-            match = re.search(r"Mounted (\S+) at (\S+)", proc.stdout.decode("utf-8"))
+            match = MOUNTED_RE.search(proc.stdout.decode("utf-8"))
             assert match is not None
             mount_point = pathlib.Path(match.group(2))
 
@@ -395,7 +445,7 @@ def btrfs_mount_point(
                 "/usr/bin/udisksctl", "loop-delete", "--no-user-interaction",
                 "--block-device", loop_dev
             ],
-            check=False, capture_output=True
+            check=False, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
         )
         if proc.returncode == 1:
             # Ignore harmless error that sometimes shows up in loop-delete:
@@ -410,47 +460,74 @@ def btrfs_mount_point(
             )
 
 
+def fill_up_filesystem(filename: pathlib.Path) -> None:
+    """Allocate all the free space in the filesystem to filename."""
+    with filename.open("wb") as zero_file:
+        size = 0
+        # A failed fallocate() allocates nothing, so start with large blocks
+        # and then fill the remaining space with small blocks:
+        for block_size in (1 << 20, 1 << 12):
+            with pytest.raises(OSError, match="No space left on device"):
+                while True:
+                    os.posix_fallocate(zero_file.fileno(), size, block_size)
+                    size += block_size
+
+
+@pytest.fixture(name="btrfs_root", scope="session")
+def fixture_btrfs_root(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Iterator[pathlib.Path]:
+    """Mount a single btrfs filesystem shared by all btrfs tests in the session."""
+    with btrfs_mount_point(tmp_path_factory.mktemp("btrfs")) as mount_point:
+        yield mount_point
+
+
+@pytest.fixture(name="btrfs_sandbox")
+def fixture_btrfs_sandbox(
+    btrfs_root: pathlib.Path, request: pytest.FixtureRequest
+) -> pathlib.Path:
+    """Create a fresh folder for a single test in the shared btrfs filesystem."""
+    # Name the folder after the test, like tmp_path does:
+    sandbox = btrfs_root / re.sub(r"\W", "_", request.node.name)
+    sandbox.mkdir()
+    return sandbox
+
+
+@pytest.mark.xdist_group("btrfs")
 def test_btrfs_mount_point(tmp_path: pathlib.Path) -> None:
     """Test the btrfs_mount_point context manager."""
     with btrfs_mount_point(tmp_path, test_already_mounted=True):
         pass
 
 
+@pytest.mark.xdist_group("btrfs")
 @pytest.mark.parametrize(("toml_config", "short_test"), [
     ("blue-local.toml", False),
     ("blue-remote-target.toml", True),
 ])
 def test_btrfs(
-    tmp_path: pathlib.Path,
+    btrfs_sandbox: pathlib.Path,
     capsys: pytest.CaptureFixture[str],
+    data_to_backup: pathlib.Path,
     *,
     toml_config: str,
     short_test: bool,
 ) -> None:
     """Test backup to a btrfs target location."""
-    with btrfs_mount_point(tmp_path) as mount_point:
-        # Run the local test in the btrfs:
-        test_basic_fs(
-            mount_point, capsys,
-            toml_config=toml_config, short_test=short_test
-        )
+    # Run the local test in the btrfs:
+    test_basic_fs(
+        btrfs_sandbox, capsys, data_to_backup,
+        toml_config=toml_config, short_test=short_test
+    )
 
-        if short_test:
-            return
+    if short_test:
+        return
 
-        (mount_point / "data-to-backup" / "new-file.txt").touch()
-        # Fill up the btrfs with zeros:
-        proc = subprocess.run(
-            ["/usr/bin/cp", "/dev/zero", str(mount_point / "zero")],
-            check=False, capture_output=True
-        )
-        assert proc.returncode == 1
-        assert (
-            proc.stderr.decode("utf-8") ==
-            f"/usr/bin/cp: error writing '{mount_point}/zero': "
-            "No space left on device\n"
-        )
-        toml_filename = str(mount_point / toml_config)
+    (btrfs_sandbox / "data-to-backup" / "new-file.txt").touch()
+    zero_file = btrfs_sandbox / "zero"
+    try:
+        fill_up_filesystem(zero_file)
+        toml_filename = str(btrfs_sandbox / toml_config)
         # Test blue-backup failure with full device.
         with pytest.raises(SystemExit, match="1"):
             while True:  # Keep going until it fails to write to the log file.
@@ -463,21 +540,28 @@ def test_btrfs(
                 )
         captured = capsys.readouterr()
         assert captured.err.splitlines()[-1] in (
-            f"    Error writing to log '{mount_point}/target/2000-01-16.log': "
+            f"    Error writing to log '{btrfs_sandbox}/target/2000-01-16.log': "
             "[Errno 28] No space left on device",
             "    Error writing to log "
-            f"'127.0.0.1:{mount_point}/target/1999-12-25.log': Failure",
+            f"'127.0.0.1:{btrfs_sandbox}/target/1999-12-25.log': Failure",
+        )
+    finally:
+        # Release the space for the other tests sharing the btrfs:
+        zero_file.unlink(missing_ok=True)
+        subprocess.run(
+            ["/usr/bin/sync", "--file-system", str(btrfs_sandbox)], check=True
         )
 
 
 def test_remote_target_and_source(
     tmp_path: pathlib.Path,
     capsys: pytest.CaptureFixture[str],
+    data_to_backup: pathlib.Path,
 ) -> None:
     """Test backup to a remote target and source location."""
     with pytest.raises(AssertionError) as exc_info:
         test_basic_fs(
-            tmp_path, capsys,
+            tmp_path, capsys, data_to_backup,
             toml_config="blue-remote-target-and-source.toml", short_test=True
         )
     assert "The source and destination cannot both be remote." in str(exc_info.value)
@@ -492,26 +576,26 @@ def test_remote_target_and_source(
 def test_collect_mode(
     tmp_path: pathlib.Path,
     capsys: pytest.CaptureFixture[str],
+    data_to_backup: pathlib.Path,
 ) -> None:
     """Test backup collection mode."""
-    shutil.copytree("tests/data-to-backup", tmp_path / "data-to-backup")
+    clone_tree(data_to_backup, tmp_path / "data-to-backup")
     collect_path = tmp_path / "collect"
     collect_path.mkdir()
     toml_file = tmp_path / "blue-collect.toml"
-    with toml_file.open("w") as tfile:
-        tfile.write(
-            "target-location='{TOML_FOLDER}/collect'\n"
-            "[backup-folders]\n"
-            "'{TOML_FOLDER}/data-to-backup' = {target='local'}\n"
-            "'127.0.0.1:{TOML_FOLDER}/data-to-backup' = {"
-            "target='remote/data',"
-            # Use current user and group in test to avoid permission errors:
-            f"chown='{os.geteuid()}:{os.getegid()}',"
-            # Use weird file permissions:
-            "chmod='707'"
-            "}\n"
-            "'727.0.0.1:{TOML_FOLDER}/data-to-backup' = {target='remote7'}\n"
-        )
+    toml_file.write_text(
+        "target-location='{TOML_FOLDER}/collect'\n"
+        "[backup-folders]\n"
+        "'{TOML_FOLDER}/data-to-backup' = {target='local'}\n"
+        "'127.0.0.1:{TOML_FOLDER}/data-to-backup' = {"
+        "target='remote/data',"
+        # Use current user and group in test to avoid permission errors:
+        f"chown='{os.geteuid()}:{os.getegid()}',"
+        # Use weird file permissions:
+        "chmod='707'"
+        "}\n"
+        "'727.0.0.1:{TOML_FOLDER}/data-to-backup' = {target='remote7'}\n"
+    )
     with pytest.raises(SystemExit, match="1"):
         blue_backup.main(str(toml_file), "--first-time")
     captured = capsys.readouterr()
@@ -539,19 +623,19 @@ def test_collect_mode(
 def test_collect_mode_remote(
     tmp_path: pathlib.Path,
     capsys: pytest.CaptureFixture[str],
+    data_to_backup: pathlib.Path,
 ) -> None:
     """Test backup collection mode."""
-    shutil.copytree("tests/data-to-backup", tmp_path / "data-to-backup")
+    clone_tree(data_to_backup, tmp_path / "data-to-backup")
     collect_path = tmp_path / "collect"
     collect_path.mkdir()
     toml_file = tmp_path / "blue-collect.toml"
-    with toml_file.open("w") as tfile:
-        tfile.write(
-            "target-location='127.0.0.1:{TOML_FOLDER}/collect'\n"
-            "[backup-folders]\n"
-            "'{TOML_FOLDER}/data-to-backup' = {target='local'}\n"
-            "'127.0.0.1:{TOML_FOLDER}/data-to-backup' = {target='remote'}\n"
-        )
+    toml_file.write_text(
+        "target-location='127.0.0.1:{TOML_FOLDER}/collect'\n"
+        "[backup-folders]\n"
+        "'{TOML_FOLDER}/data-to-backup' = {target='local'}\n"
+        "'127.0.0.1:{TOML_FOLDER}/data-to-backup' = {target='remote'}\n"
+    )
     with pytest.raises(SystemExit, match="1"):
         blue_backup.main(str(toml_file), "--first-time")
     captured = capsys.readouterr()
@@ -600,12 +684,11 @@ def test_backup_summary(
     toml_file = tmp_path / "blue.toml"
 
     # Summary should be shown even with rsync errors:
-    with toml_file.open("w") as tfile:
-        tfile.write(
-            "target-location='{TOML_FOLDER}/{TODAY}'\n"
-            "[backup-folders]\n"
-            "'{TOML_FOLDER}/no-such-folder' = { target='nor-such-folder' }\n"
-        )
+    toml_file.write_text(
+        "target-location='{TOML_FOLDER}/{TODAY}'\n"
+        "[backup-folders]\n"
+        "'{TOML_FOLDER}/no-such-folder' = { target='nor-such-folder' }\n"
+    )
     blue_backup.main("--first-time", str(toml_file))
     captured = capsys.readouterr()
     assert "    nor-such-folder | " in captured.out
@@ -614,32 +697,61 @@ def test_backup_summary(
     )
 
 
+@pytest.mark.slow
 def test_rsync_timeout(
     tmp_path: pathlib.Path,
     capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test timeout during rsync."""
     toml_file = tmp_path / "blue.toml"
 
-    save_rsync_timeout = blue_backup.RSYNC_TIMEOUT
-    try:
-        blue_backup.RSYNC_TIMEOUT = 1
-        with toml_file.open("w") as tfile:
-            tfile.write(
-                "target-location='127.0.0.1:{TOML_FOLDER}/{TODAY}'\n"
-                "rsync-options=['--rsh', 'ssh 127.0.0.1 sleep 20;']\n"
-                "[backup-folders]\n"
-                "'{TOML_FOLDER}'={target='target'}\n"
-            )
-        blue_backup.main(str(toml_file), "--first-time")
-        captured = capsys.readouterr()
-        assert captured.err.startswith(
-            f"    Errors in rsync from: {tmp_path}/ to: target\n"
-            "    [sender] io timeout after 1 seconds -- exiting\n"
-            "    rsync error: timeout in data send/receive (code 30)"
+    monkeypatch.setattr(blue_backup, "RSYNC_TIMEOUT", 1)
+    toml_file.write_text(
+        "target-location='127.0.0.1:{TOML_FOLDER}/{TODAY}'\n"
+        "rsync-options=['--rsh', 'ssh 127.0.0.1 sleep 20;']\n"
+        "[backup-folders]\n"
+        "'{TOML_FOLDER}'={target='target'}\n"
+    )
+    blue_backup.main(str(toml_file), "--first-time")
+    captured = capsys.readouterr()
+    assert captured.err.startswith(
+        f"    Errors in rsync from: {tmp_path}/ to: target\n"
+        "    [sender] io timeout after 1 seconds -- exiting\n"
+        "    rsync error: timeout in data send/receive (code 30)"
+    )
+
+
+def test_rsync_timeout_report(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test reporting of rsync timeout, without waiting for the timeout."""
+    monkeypatch.setattr(blue_backup, "RSYNC_TIMEOUT", 1)
+    rsync_args = stub_rsync(monkeypatch, subprocess.CompletedProcess(
+        [], returncode=30, stdout=b"", stderr=(
+            b"[sender] io timeout after 1 seconds -- exiting\n"
+            b"rsync error: timeout in data send/receive (code 30)"
+            b" at io.c(201) [sender=3.2.7]\n"
         )
-    finally:
-        blue_backup.RSYNC_TIMEOUT = save_rsync_timeout
+    ))
+    toml_file = tmp_path / "blue.toml"
+    toml_file.write_text(
+        "target-location='{TOML_FOLDER}/{TODAY}'\n"
+        "[backup-folders]\n"
+        "'{TOML_FOLDER}/source'={target='target'}\n"
+    )
+    blue_backup.main(str(toml_file), "--first-time")
+    assert len(rsync_args) == 1
+    assert "--timeout=1" in rsync_args[0]
+    captured = capsys.readouterr()
+    assert captured.err == (
+        f"    Errors in rsync from: {tmp_path}/source/ to: target\n"
+        "    [sender] io timeout after 1 seconds -- exiting\n"
+        "    rsync error: timeout in data send/receive (code 30)"
+        " at io.c(201) [sender=3.2.7]\n"
+    )
 
 
 def test_terminal_output(
@@ -682,9 +794,9 @@ def test_main_entry_point(
     assert captured.out == ""
     assert "error: the following arguments are required: toml_config" in captured.err
 
-    monkeypatch.setattr(sys, "argv", ["", "--version"])
+    # The __main__ guard is covered above, no need to re-run the module:
     with pytest.raises(SystemExit, match="0"):
-        runpy.run_module("blue_backup", run_name="__main__", alter_sys=True)
+        blue_backup.main("--version")
     captured = capsys.readouterr()
     assert captured.out == f"blue-backup {blue_backup.VERSION}\n"
     assert captured.err == ""
@@ -18,14 +18,13 @@ def test_local(
     """Test backup with no paramiko installed."""
     toml_file = tmp_path / "blue.toml"
 
-    with toml_file.open("w") as tfile:
-        tfile.write(
-            "target-location = '{TOML_FOLDER}/{TODAY}'\n"
-            "[backup-folders]\n"
-            "'{TOML_FOLDER}' = { target='local' }\n"
-            # Remote source folder should still work:
-            "'127.0.0.1:{TOML_FOLDER}' = { target='remote' }\n"
-        )
+    toml_file.write_text(
+        "target-location = '{TOML_FOLDER}/{TODAY}'\n"
+        "[backup-folders]\n"
+        "'{TOML_FOLDER}' = { target='local' }\n"
+        # Remote source folder should still work:
+        "'127.0.0.1:{TOML_FOLDER}' = { target='remote' }\n"
+    )
     blue_backup.main(str(toml_file), "--first-time")
     captured = capsys.readouterr()
     assert (
@@ -41,12 +40,11 @@ def test_remote_target(
     """Test failure mode for remote target with no paramiko installed."""
     toml_file = tmp_path / "blue.toml"
 
-    with toml_file.open("w") as tfile:
-        tfile.write(
-            "target-location = '127.0.0.1:{TOML_FOLDER}/{TODAY}'\n"
-            "[backup-folders]\n"
-            "'{TOML_FOLDER}' = { target='target' }\n"
-        )
+    toml_file.write_text(
+        "target-location = '127.0.0.1:{TOML_FOLDER}/{TODAY}'\n"
+        "[backup-folders]\n"
+        "'{TOML_FOLDER}' = { target='target' }\n"
+    )
     with pytest.raises(SystemExit, match="1"):
         blue_backup.main(str(toml_file), "--first-time")
     captured = capsys.readouterr()